@@ -36,24 +36,55 @@ def find_pyproject_toml_files_glob(base_directory, exclude_dirs=None):
     return pyproject_files
 
 
-# Approach 3: Using Path.glob with exclusion during traversal
-def find_pyproject_toml_files_pathlib(base_directory, exclude_dirs=None):
+# Approach 3: Using os.scandir recursion with exclusion during traversal
+def find_pyproject_toml_files_scandir(base_directory, exclude_dirs=None):
     if exclude_dirs is None:
         exclude_dirs = ['__pycache__', '.vscode', '.git']
-    
-    base_path = Path(base_directory)
+
     exclude_dirs = set(exclude_dirs)
     pyproject_files = []
 
     def recursive_search(current_path):
-        for path in current_path.glob('*'):
-            if path.is_dir():
-                if path.name not in exclude_dirs:
-                    recursive_search(path)
-            elif path.name == 'pyproject.toml':
-                pyproject_files.append(str(path))
-
-    recursive_search(base_path)
+        with os.scandir(current_path) as it:
+            for entry in it:
+                # DirEntry types come cached from readdir, so no stat per entry
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in exclude_dirs:
+                        recursive_search(entry.path)
+                elif entry.name == 'pyproject.toml':
+                    pyproject_files.append(entry.path)
+
+    recursive_search(str(base_directory))
+    return pyproject_files
+
+# Approach 4: Using os.fwalk (dir-fd based, fewer path resolutions per descent)
+def find_pyproject_toml_files_fwalk(base_directory, exclude_dirs=None):
+    if exclude_dirs is None:
+        exclude_dirs = ['__pycache__', '.vscode', '.git']
+
+    pyproject_files = []
+
+    for root, dirs, files, dirfd in os.fwalk(base_directory):
+        dirs[:] = [d for d in dirs if d not in exclude_dirs]
+
+        if 'pyproject.toml' in files:
+            pyproject_files.append(os.path.join(root, 'pyproject.toml'))
+
+    return pyproject_files
+
+# Approach 5: Using Path.walk (Python 3.12+)
+def find_pyproject_toml_files_path_walk(base_directory, exclude_dirs=None):
+    if exclude_dirs is None:
+        exclude_dirs = ['__pycache__', '.vscode', '.git']
+
+    pyproject_files = []
+
+    for root, dirs, files in Path(base_directory).walk():
+        dirs[:] = [d for d in dirs if d not in exclude_dirs]
+
+        if 'pyproject.toml' in files:
+            pyproject_files.append(str(root / 'pyproject.toml'))
+
     return pyproject_files
 
 # Helper function to create random files
@@ -96,11 +127,17 @@ def measure_performance():
     try:
         os_walk_time = timeit.timeit(lambda: find_pyproject_toml_files_os_walk(base_dir), number=10)
         glob_time = timeit.timeit(lambda: find_pyproject_toml_files_glob(base_dir), number=10)
-        pathlib_time = timeit.timeit(lambda: find_pyproject_toml_files_pathlib(base_dir), number=10)
-        
+        pathlib_time = timeit.timeit(lambda: find_pyproject_toml_files_scandir(base_dir), number=10)
+        fwalk_time = timeit.timeit(lambda: find_pyproject_toml_files_fwalk(base_dir), number=10)
+
         print(f"os.walk approach: {os_walk_time:.6f} seconds")
         print(f"glob approach: {glob_time:.6f} seconds")
-        print(f"Path.glob approach: {pathlib_time:.6f} seconds")
+        print(f"os.scandir approach: {pathlib_time:.6f} seconds")
+        print(f"os.fwalk approach: {fwalk_time:.6f} seconds")
+
+        if hasattr(Path, 'walk'):  # Python 3.12+
+            path_walk_time = timeit.timeit(lambda: find_pyproject_toml_files_path_walk(base_dir), number=10)
+            print(f"Path.walk approach: {path_walk_time:.6f} seconds")
     finally:
         clean_test_environment(base_dir)
 
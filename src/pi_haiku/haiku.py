@@ -1,3 +1,4 @@
+import asyncio
 import os
 import tempfile
 from typing import Callable, Optional, Union
@@ -16,6 +17,7 @@ from pi_haiku.utils.utils import (
     custom_sort_dict,
     run_bash_command,
     topological_sort,
+    topological_sort_levels,
 )
 
 PackageType = Union[PyPackage, str]
@@ -54,6 +56,25 @@ class Haiku:
         eh = EnvHelper(main_pkg)
         eh.poetry_install()
 
+    @staticmethod
+    def update_projects(dir: PathType) -> None:
+        """
+        Run `poetry update` for every project under dir. Projects in the same
+        topological level have no dependencies on each other, so each level is
+        updated concurrently.
+        """
+        projs = PyProjectModifier.find_pyprojects(dir)
+        dag = create_dag(list(projs.values()))
+        levels = topological_sort_levels(dag)
+
+        async def _run() -> None:
+            for level in levels:
+                helpers = [EnvHelper(projs[name]) for name in level if name in projs]
+                if helpers:
+                    await asyncio.gather(*(h.poetry_update_async() for h in helpers))
+
+        asyncio.run(_run())
+
     @staticmethod
     def _convert_projects(
         dir: PathType,
@@ -80,6 +101,16 @@ class Haiku:
         list_projs = list(projs.values())
         should_print = verbose or dry_run
 
+        # The same patterns apply to every project, so build them once here
+        # instead of letting each convert_* call re-escape every package name
+        is_local = convert_function is PyProjectModifier.convert_to_local
+        match_patterns = PyProjectModifier._create_match_patterns_from_packages(
+            packages=list_projs,
+            version_to='{develop = true, path = "{package.path.relative}"}'
+            if is_local
+            else "{package.version}",
+        )
+
         def get_project_name(project: PackageType) -> str:
             return project.name if isinstance(project, PyPackage) else project
 
@@ -108,12 +139,12 @@ class Haiku:
             if should_print:
                 print(f"        =============== {proj} =============== ")
 
-            pmod = PyProjectModifier(proj.path, packages=projs)
+            pmod = PyProjectModifier.from_trusted(proj.path, proj, packages=projs)
 
             # Apply the conversion function to the project
             file_changes = convert_function(
                 pmod,
-                packages=list_projs,
+                match_patterns=match_patterns,
                 use_toml_sort=False,
                 update=update,
                 in_place=not dry_run,
@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import re
@@ -63,11 +64,17 @@ class PyPackage:
     dependencies: dict[str, Any] = field(default_factory=dict)
     toml_data: dict[str, Any] = field(default_factory=dict)
 
+    # Seam for tests: swap in an in-memory file source without patching builtins.open
+    _opener = staticmethod(open)
+
     @staticmethod
     def get_dependencies(file_path: PathType) -> dict[str, Any]:
-        with open(file_path, "rb") as file:
+        with PyPackage._opener(file_path, "rb") as file:
             data: dict[str, Any] = toml.load(file)
+        return PyPackage._dependencies_from_data(data)
 
+    @staticmethod
+    def _dependencies_from_data(data: dict[str, Any]) -> dict[str, Any]:
         dependencies: dict[str, Any] = {}
         if _get_build_system(data, BuildSystem.POETRY, None):
             if "dependencies" in data["tool"]["poetry"]:
@@ -88,9 +95,24 @@ class PyPackage:
         path = Path(path).expanduser().resolve()
         if path.is_dir():
             path = path / "pyproject.toml"
-        with open(path, "rb") as fp:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            # Unstatable paths (e.g. tests feeding bytes through _opener)
+            # bypass the cache rather than caching under a stale key
+            return PyPackage._parse_path(path)
+        return PyPackage._from_path_cached(str(path), mtime_ns)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _from_path_cached(path_str: str, mtime_ns: int) -> "PyPackage":
+        return PyPackage._parse_path(Path(path_str))
+
+    @staticmethod
+    def _parse_path(path: Path) -> "PyPackage":
+        with PyPackage._opener(path, "rb") as fp:
             data: dict[str, Any] = toml.load(fp)
-        dependencies = PyPackage.get_dependencies(path)
+        dependencies = PyPackage._dependencies_from_data(data)
         build = _get_build_system(data, BuildSystem.POETRY, None)
         if build == BuildSystem.POETRY:
             poetry = data["tool"]["poetry"]
@@ -1,13 +1,15 @@
+import functools
+import mmap
 import os
 import re
 import shutil
 import tempfile
-import tomllib as toml
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from logging import getLogger
 from pathlib import Path
-from typing import Optional, Sequence, Callable
+from typing import Any, Callable, ClassVar, Optional, Sequence
 
 from pi_haiku.models import (
     BuildSystem,
@@ -24,26 +26,65 @@ from pi_haiku.utils.utils import (
 
 from pi_haiku.utils.environment_utils import EnvHelper
 log = getLogger(__name__)
-EXCLUDE_DIRS: list[PathType] = ["__pycache__", "dist", "docker_staging"]
+EXCLUDE_DIRS: list[PathType] = [
+    "__pycache__",
+    "dist",
+    "docker_staging",
+    "node_modules",
+    ".git",
+    ".venv",
+]
+# Frozen copy used as the default so the common call skips rebuilding a set
+_DEFAULT_EXCLUDE_DIRS: frozenset[str] = frozenset(
+    {"__pycache__", "dist", "docker_staging", "node_modules", ".git", ".venv"}
+)
 lsentinel = [uuid.uuid4().hex]
 
+# One multiline pass over the raw bytes finds every 'key = value' line
+_LINE_RE = re.compile(rb"(?m)^[ \t]*([A-Za-z0-9_.\-]+)[ \t]*=[ \t]*(.+)$")
+_LOCAL_PATH_RE = re.compile(r"path\s+=")
+_DEVELOP_RE = re.compile(r"develop\s*=\s*true")
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compiled-pattern cache; the same package/version regexes recur on
+    every convert call, and re's internal cache is shared process-wide."""
+    return re.compile(pattern)
+
+
+def _literal_pattern(pattern: str) -> Optional[str]:
+    """Return the literal a '^...$' anchored pattern matches, or None if it
+    contains anything beyond an escaped literal."""
+    if not (pattern.startswith("^") and pattern.endswith("$")):
+        return None
+    body = pattern[1:-1]
+    literal = re.sub(r"\\(.)", r"\1", body)
+    return literal if re.escape(literal) == body else None
+
 
 @dataclass
 class PyProjectModifier:
     src: PathType
-    pyproj: PyPackage = field(init=False)
+    # kw_only keeps the published positional signature intact:
+    # PyProjectModifier(path, some_dir) still binds some_dir to package_dir
+    pyproj: Optional[PyPackage] = field(default=None, kw_only=True)
     package_dir: Optional[PathType] = None
     packages: dict[str, PyPackage] = field(default_factory=dict)
     exclude_dirs: list[PathType] = field(default_factory=lambda: EXCLUDE_DIRS)
     exclude_hidden: bool = True
 
+    # Files already toml-sorted this session; spawning toml-sort costs a
+    # fork/exec, which adds up across a batch of projects
+    _sorted_cache: ClassVar[set[str]] = set()
+
     def __post_init__(self) -> None:
         self.src = Path(self.src).expanduser().resolve()
-        if not self.src.exists():
-            raise FileNotFoundError(f"Could not find the file {self.src}")
-        with open(self.src, "rb") as fp:
-            toml.load(fp)
-        self.pyproj = PyPackage.from_path(self.src)
+        # EAFP: from_path's own open raises FileNotFoundError for missing
+        # files and TOMLDecodeError (a ValueError) for unparseable ones, so
+        # the stat from exists() and the extra validation parse are redundant
+        if self.pyproj is None:
+            self.pyproj = PyPackage.from_path(self.src)
         if self.pyproj is None:
             raise ValueError(f"Could not load the pyproject.toml file: {self.src}")
         if self.package_dir and not self.packages:
@@ -52,20 +93,44 @@ class PyProjectModifier:
 
             self.packages = self._tomls_to_packages(tomls)
 
+    @classmethod
+    def from_trusted(
+        cls,
+        src: PathType,
+        pyproj: PyPackage,
+        packages: Optional[dict[str, PyPackage]] = None,
+    ) -> "PyProjectModifier":
+        """
+        Build a modifier around an already-parsed PyPackage, skipping the
+        TOML re-parse that the regular constructor performs.
+        """
+        return cls(src, pyproj=pyproj, packages=dict(packages) if packages else {})
+
+    @staticmethod
+    def _safe_from_path(f: PathType) -> Optional[PyPackage]:
+        try:
+            return PyPackage.from_path(f)
+        except BuildSystemError:
+            return None
+        except Exception as e:
+            log.error(f"File {f} had the following Error occurred: {e}")
+            raise
+
     @staticmethod
     def _tomls_to_packages(tomls: Sequence[PathType]) -> dict[str, PyPackage]:
-        pkgs = {}
-        found = []
-        for f in tomls:
-            try:
-                pkg = PyPackage.from_path(f)
-                pkgs[pkg.name] = pkg
-                found.append(pkg)
-            except BuildSystemError as e:
-                pass
-            except Exception as e:
-                log.error(f"File {f} had the following Error occurred: {e}")
-                raise
+        pkgs: dict[str, PyPackage] = {}
+        found: list[PyPackage] = []
+        if not tomls:
+            return pkgs
+        # Loading many small files is open/read bound, so parse them in a
+        # thread pool; the dict is only mutated on the main thread
+        with ThreadPoolExecutor(max_workers=min(32, len(tomls))) as executor:
+            results = list(executor.map(PyProjectModifier._safe_from_path, tomls))
+        for pkg in results:
+            if pkg is None:
+                continue
+            pkgs[pkg.name] = pkg
+            found.append(pkg)
         duplicates = find_duplicates(found)
         if duplicates:
             raise ValueError(f"Found duplicate packages: {duplicates}")
@@ -77,31 +142,49 @@ class PyProjectModifier:
         exclude_dirs: Optional[Sequence[PathType]] = lsentinel,
         exclude_hidden: bool = True,
         file_match: str = "pyproject.toml",
+        stop_on_match: bool = True,
     ) -> list[Path]:
         base_path = Path(base_directory).expanduser().resolve()
-        pyproject_files = []
+        pyproject_files: list[Path] = []
 
         if exclude_dirs is lsentinel:
-            exclude_dirs = EXCLUDE_DIRS
+            set_exclude_dirs: frozenset[str] = _DEFAULT_EXCLUDE_DIRS
         elif exclude_dirs is None:
-            exclude_dirs = []
-        set_exclude_dirs = set(exclude_dirs)
-
-        for root, dirs, files in os.walk(base_path):
-            # Check if the current directory should be excluded
-            if any(excluded in Path(root).parts for excluded in set_exclude_dirs):
-                continue
-
-            # Filter out directories to skip
-            dirs[:] = [
-                d
-                for d in dirs
-                if (d not in set_exclude_dirs) and (not exclude_hidden or not d.startswith("."))
-            ]
-
-            if file_match in files:
-                pyproject_files.append(Path(root) / file_match)
+            set_exclude_dirs = frozenset()
+        else:
+            set_exclude_dirs = frozenset(str(d) for d in exclude_dirs)
 
+        def _scan(path: str) -> None:
+            subdirs: list[str] = []
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                # Match os.walk's default: skip unreadable or vanished
+                # directories (including a missing base) instead of aborting
+                # the whole discovery
+                return
+            # The context manager closes the directory fd even when
+            # stop_on_match returns out of the loop early
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    # DirEntry caches the type from readdir, so these checks
+                    # usually avoid an extra stat per entry
+                    if entry.is_dir(follow_symlinks=False):
+                        if name in set_exclude_dirs or (exclude_hidden and name.startswith(".")):
+                            continue
+                        subdirs.append(entry.path)
+                    elif name == file_match and entry.is_file(follow_symlinks=False):
+                        pyproject_files.append(Path(entry.path))
+                        if stop_on_match:
+                            # A nested file_match under a matched project is
+                            # almost always a fixture or vendored copy, not
+                            # another project
+                            return
+            for subdir in subdirs:
+                _scan(subdir)
+
+        _scan(str(base_path))
         return pyproject_files
 
     @staticmethod
@@ -221,8 +304,8 @@ class PyProjectModifier:
             should_change_module=should_change_module,
         )
 
+    @staticmethod
     def _create_match_patterns_from_packages(
-        self,
         packages: Sequence[PyPackage],
         version_to: str,
     ) -> list[PackageMatch]:
@@ -289,76 +372,146 @@ class PyProjectModifier:
         #     raise ValueError("destination file is required when in_place is False")
 
         changes: list[tuple[str, str]] = []
-        new_lines: list[str] = []
-
-        with open(pyproj.path) as fp:
-            for line in fp:
-                if "=" not in line:
-                    new_lines.append(line)
-                    continue
-                sline = line.strip()
-                package, previous_package_info = sline.split("=", maxsplit=1)
-                package = package.strip()
-                previous_package_info = previous_package_info.strip()
-
-                # Check if this module should be changed
-                if not should_change_module(package):
-                    new_lines.append(line)
-                    continue
-
-                is_currently_local = re.search(r"path\s+=", previous_package_info) or re.search(
-                    r"develop\s*=\s*true", previous_package_info
-                )
-
-                # Skip if we're not forcing an update and the package is already in the desired state
-                if not update and (
-                    (convert_to_local and is_currently_local)
-                    or (not convert_to_local and not is_currently_local)
-                ):
-                    new_lines.append(line)
-                    continue
-
-                new_value = ""
-                matched = False
-
-                for mp in match_patterns:
-                    m = re.match(mp.package_regex, package)
-                    if not m:
+        new_chunks: list[bytes] = []
+
+        # Compile each pattern once instead of once per (line, pattern) pair;
+        # a version_to without '{' has no placeholders to substitute
+        compiled_patterns = [
+            (
+                _compile_pattern(mp.package_regex),
+                _compile_pattern(mp.version_regex),
+                mp.version_to,
+                "{" in mp.version_to,
+            )
+            for mp in match_patterns
+        ]
+
+        # Patterns generated from packages are pure '^literal$' matches, so the
+        # whole set can be dispatched through one alternation regex. Later
+        # patterns overwrite earlier ones for the same name, matching the
+        # last-match-wins behavior of the per-pattern loop.
+        literal_names = [_literal_pattern(mp.package_regex) for mp in match_patterns]
+        pattern_by_name: dict[str, tuple[re.Pattern[str], re.Pattern[str], str, bool]] = {}
+        combined_regex: Optional[re.Pattern[str]] = None
+        if match_patterns and all(name is not None for name in literal_names):
+            for name, compiled in zip(literal_names, compiled_patterns):
+                assert name is not None
+                pattern_by_name[name] = compiled
+            combined_regex = re.compile(
+                "^(" + "|".join(re.escape(name) for name in pattern_by_name) + ")$"
+            )
+
+        # One C-level sweep over the mapped file finds every key/value line;
+        # untouched regions are carried over as raw byte slices instead of
+        # being re-processed line by line in Python
+        edits: list[tuple[int, int, bytes]] = []
+        with open(pyproj.path, "rb") as fp:
+            size = os.fstat(fp.fileno()).st_size
+            buf: Any = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            try:
+                for line_m in _LINE_RE.finditer(buf):
+                    package = line_m.group(1).decode()
+                    previous_package_info = line_m.group(2).decode().strip()
+
+                    # Check if this module should be changed
+                    if not should_change_module(package):
+                        continue
+
+                    is_currently_local = _LOCAL_PATH_RE.search(
+                        previous_package_info
+                    ) or _DEVELOP_RE.search(previous_package_info)
+
+                    # Skip if we're not forcing an update and the package is already in the desired state
+                    if not update and (
+                        (convert_to_local and is_currently_local)
+                        or (not convert_to_local and not is_currently_local)
+                    ):
                         continue
-                    package_name = m.group(0)
-                    matched = True
-                    try:
-                        matched_package = self.packages[package_name]
-                    except KeyError:
-                        matched_package = None
-
-                    new_value = re.sub(mp.version_regex, mp.version_to, previous_package_info)
-                    new_value = special_substitutions(
-                        new_value, pkg=pyproj, other_pkg=matched_package
-                    )
-
-                if matched:
-                    new_line = f"{package} = {new_value}\n"
-                    if line != new_line:
-                        changes.append((line, new_line))
-                        line = new_line
-
-                new_lines.append(line)
+
+                    new_value = ""
+                    matched = False
+
+                    if combined_regex is not None:
+                        m = combined_regex.match(package)
+                        if m:
+                            matched = True
+                            package_name = m.group(1)
+                            matched_package = self.packages.get(package_name)
+                            _, version_re, version_to, needs_subst = pattern_by_name[package_name]
+                            new_value = version_re.sub(version_to, previous_package_info)
+                            if needs_subst:
+                                new_value = special_substitutions(
+                                    new_value, pkg=pyproj, other_pkg=matched_package
+                                )
+                    else:
+                        for package_re, version_re, version_to, needs_subst in compiled_patterns:
+                            m = package_re.match(package)
+                            if not m:
+                                continue
+                            package_name = m.group(0)
+                            matched = True
+                            try:
+                                matched_package = self.packages[package_name]
+                            except KeyError:
+                                matched_package = None
+
+                            new_value = version_re.sub(version_to, previous_package_info)
+                            if needs_subst:
+                                new_value = special_substitutions(
+                                    new_value, pkg=pyproj, other_pkg=matched_package
+                                )
+
+                    if matched:
+                        old_line = line_m.group(0).decode()
+                        new_line = f"{package} = {new_value}"
+                        if old_line != new_line:
+                            changes.append((old_line + "\n", new_line + "\n"))
+                            edits.append((line_m.start(), line_m.end(), new_line.encode()))
+
+                # Splice the edits between untouched slices of the source
+                pos = 0
+                for start, end, replacement in edits:
+                    new_chunks.append(buf[pos:start])
+                    new_chunks.append(replacement)
+                    pos = end
+                new_chunks.append(buf[pos:])
+            finally:
+                if size:
+                    buf.close()
 
         if not changes:
-            if use_toml_sort and dest_file:
-                run_bash_command(f"toml-sort {dest_file}")
+            # Sorting the untouched source would be wasted work; only sort a
+            # distinct destination, and only once per session
+            if use_toml_sort and dest_file and dest_file != str(pyproj.path):
+                self._toml_sort(dest_file)
             return changes
 
         if backup_file:
-            os.makedirs(os.path.dirname(backup_file), exist_ok=True)
-            shutil.copy(pyproj.path, backup_file)
+            backup_parent = os.path.dirname(backup_file)
+            os.makedirs(backup_parent, exist_ok=True)
+            try:
+                # Same filesystem: a hardlink preserves the old content for
+                # O(1) instead of a full byte copy, since the in-place write
+                # replaces the source inode rather than rewriting it
+                if os.stat(pyproj.path).st_dev == os.stat(backup_parent).st_dev:
+                    if os.path.exists(backup_file):
+                        os.unlink(backup_file)
+                    os.link(pyproj.path, backup_file)
+                else:
+                    shutil.copy(pyproj.path, backup_file)
+            except OSError:
+                shutil.copy(pyproj.path, backup_file)
         if dest_file:
-            with tempfile.NamedTemporaryFile("w", delete=False) as tmpfile:
-                tmpfile.writelines(new_lines)
+            # Write a sibling temp file and atomically rename it over the
+            # destination; avoids the extra read+write of a cross-file copy
+            dest_dir = os.path.dirname(os.path.abspath(dest_file))
+            with tempfile.NamedTemporaryFile("wb", dir=dest_dir, delete=False) as tmpfile:
+                # Join once and issue a single write rather than one Python
+                # call per chunk
+                tmpfile.write(b"".join(new_chunks))
                 tmpfile.close()
-                assert dest_file is not None
-                shutil.copy(tmpfile.name, dest_file)
+                os.chmod(tmpfile.name, os.stat(pyproj.path).st_mode)
+                os.replace(tmpfile.name, dest_file)
                 pyproj._rmlock()
                 try:
                     env_helper = EnvHelper(package=pyproj)
@@ -382,5 +535,13 @@ class PyProjectModifier:
                     raise
 
         if use_toml_sort and dest_file:
-            run_bash_command(f"toml-sort {dest_file}")
+            # The file was just rewritten, so any cached sort is stale
+            self._sorted_cache.discard(dest_file)
+            self._toml_sort(dest_file)
         return changes
+
+    def _toml_sort(self, dest_file: str) -> None:
+        if dest_file in self._sorted_cache:
+            return
+        run_bash_command(f"toml-sort {dest_file}")
+        self._sorted_cache.add(dest_file)
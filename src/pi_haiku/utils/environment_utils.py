@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import subprocess
@@ -12,7 +13,7 @@ from pi_haiku.utils.environment_detector import (
     EnvironmentDetector,
     EnvironmentResult,
 )
-from pi_haiku.utils.utils import run_bash_command
+from pi_haiku.utils.utils import run_bash_command, run_bash_command_async
 
 # Define the TRACE level; any integer lower than 10 (DEBUG's level) will work.
 TRACE_LEVEL = 5
@@ -96,6 +97,34 @@ class EnvHelper:
             )
         return None
 
+    async def poetry_update_async(self) -> Optional[str]:
+        """
+        Async variant of poetry_update so updates for independent packages
+        can run concurrently.
+        """
+        try:
+            detect = EnvironmentDetector(self.package, self.venv_path, self.conda_base_path)
+            # Detection shells out synchronously; run it on a worker thread so
+            # concurrent updates are not serialized on the event loop
+            env_result = await asyncio.to_thread(detect.detect_environment)
+            command = f"{env_result.activate_command} && poetry update -vvv"
+            sh_result = await run_bash_command_async(command, cwd=self.package.path.parent)
+            if "No dependencies to install or update" in sh_result.stdout:
+                log.debug(f"No dependencies to install or update for {self.package.name}")
+                return None
+            log.trace(sh_result.stdout)
+            log.debug(
+                f"Update successful for {self.package.name} v{self.package.version} using {env_result.env_type} environment"
+            )
+            return sh_result.stdout
+        except EnvironmentError as e:
+            log.error(f"Installation failed for {self.package.name}: {e}")
+        except subprocess.CalledProcessError as e:
+            log.error(
+                f"Installation command failed for {self.package.name}. Check {self.error_file} for details."
+            )
+        return None
+
     def poetry_install(self) -> Optional[str]:
         try:
             detect = EnvironmentDetector(self.package, self.venv_path, self.conda_base_path)
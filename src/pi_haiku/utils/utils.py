@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import json
 import os
 import subprocess
@@ -22,7 +24,10 @@ class CommandResult:
         return self.success
 
 
+@functools.lru_cache(maxsize=1)
 def get_conda_info() -> dict[str, Any]:
+    # root_prefix never changes within a process, so one `conda info --json`
+    # subprocess (hundreds of ms) serves every subsequent command
     try:
         result = subprocess.run(
             ["conda", "info", "--json"], check=True, capture_output=True, text=True
@@ -78,6 +83,49 @@ def run_bash_command(
         return CommandResult(False, e.stdout, e.stderr)
 
 
+async def run_bash_command_async(
+    command: str,
+    output_file: Optional[str] = None,
+    error_file: Optional[str] = None,
+    cwd: Optional[PathType] = None,
+    verbose: bool = True,
+) -> CommandResult:
+    """
+    Async variant of run_bash_command so independent commands (poetry is
+    network and I/O bound) can run concurrently via asyncio.gather.
+    """
+    if cwd:
+        cwd = str(cwd)
+    if verbose:
+        print(f"Cmd: {command}, cwd={cwd}", flush=True)
+    # get_conda_info blocks on a subprocess when its cache is cold; keep it
+    # off the event loop so gathered commands stay concurrent
+    conda_info = await asyncio.to_thread(get_conda_info)
+    activate_path = os.path.join(conda_info["root_prefix"], "bin", "activate")
+    command = f"source {activate_path} && {command}"
+    proc = await asyncio.create_subprocess_shell(
+        command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    stdout_bytes, stderr_bytes = await proc.communicate()
+    stdout, stderr = stdout_bytes.decode(), stderr_bytes.decode()
+
+    if stdout and output_file:
+        with open(output_file, "w") as f:
+            f.write(stdout)
+        if verbose:
+            print(f"Command Output: {stdout}")
+    if stderr and error_file:
+        with open(error_file, "w") as f:
+            f.write(stderr)
+        if verbose:
+            print("Command Error Output:\n", stderr)
+
+    return CommandResult(proc.returncode == 0, stdout, stderr)
+
+
 def _check_value_is_primitive(value: str) -> None:
     primitives = (bool, str, int, float, type(None))
     try:
@@ -138,6 +186,35 @@ def topological_sort(dag: dict[str, set[str]]) -> list[str]:
     return result[::-1]  # reverse the result to get the correct order
 
 
+def topological_sort_levels(dag: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Group DAG nodes into levels where every node in a level depends only on
+    nodes from earlier levels, so each level can be processed concurrently.
+    """
+    indegree: dict[str, int] = {node: 0 for node in dag}
+    for dependents in dag.values():
+        for dependent in dependents:
+            indegree[dependent] = indegree.get(dependent, 0) + 1
+
+    levels: list[list[str]] = []
+    scheduled = 0
+    current = [node for node, degree in indegree.items() if degree == 0]
+    while current:
+        levels.append(current)
+        scheduled += len(current)
+        next_level: list[str] = []
+        for node in current:
+            for dependent in dag.get(node, set()):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    next_level.append(dependent)
+        current = next_level
+    if scheduled != len(indegree):
+        unscheduled = sorted(node for node, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Cycle detected: {unscheduled}")
+    return levels
+
+
 def special_substitutions(s: str, pkg: PyPackage, other_pkg: Optional[PyPackage]) -> str:
     if "{package}" in s:
         s = s.replace("{package}", pkg.name)
@@ -0,0 +1,107 @@
+import mmap
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def pytest_configure(config):
+    # Keep tmp_path traffic in RAM on Linux; the suite is dominated by many
+    # tiny TOML reads/writes. An explicit --basetemp still wins.
+    if sys.platform == "linux" and config.option.basetemp is None:
+        shm = Path("/dev/shm")
+        if shm.is_dir() and os.access(shm, os.W_OK):
+            config.option.basetemp = shm / f"pi_haiku_tests_{os.getuid()}"
+
+# Shared pyproject.toml contents, rendered once at import. Both
+# test_haiku.py and test_pyproject_modifier.py build packages from these.
+TOML_BLOBS: dict[str, bytes] = {
+    "local_package1": b"""
+[build-system]
+requires = ["poetry-core>=1.0.0"]
+build-backend = "poetry.core.masonry.api"
+
+[tool.poetry]
+name = "package1"
+version = "0.1.0"
+description = ""
+authors = ["Author One <author1@example.com>"]
+
+[tool.poetry.dependencies]
+python = "^3.9"
+package2 = { path = "../package2" }
+numpy = "^1.21.0"
+""",
+    "remote_package1": b"""
+[build-system]
+requires = ["poetry-core>=1.0.0"]
+build-backend = "poetry.core.masonry.api"
+
+[tool.poetry]
+name = "package1"
+version = "0.1.0"
+description = ""
+authors = ["Author One <author1@example.com>"]
+
+[tool.poetry.dependencies]
+python = "^3.9"
+package2 = "^0.2.0"
+numpy = "^1.21.0"
+""",
+    "package2": b"""
+[build-system]
+requires = ["poetry-core>=1.0.0"]
+build-backend = "poetry.core.masonry.api"
+
+[tool.poetry]
+name = "package2"
+version = "^0.2.0"
+description = ""
+authors = ["Author Two <author2@example.com>"]
+
+[tool.poetry.dependencies]
+python = "^3.9"
+""",
+    "package3": b"""
+[build-system]
+requires = ["poetry-core>=1.0.0"]
+build-backend = "poetry.core.masonry.api"
+
+[tool.poetry]
+name = "package3"
+version = "^0.3.0"
+description = ""
+authors = ["Author Three <author3@example.com>"]
+
+[tool.poetry.dependencies]
+python = "^3.9"
+""",
+}
+
+
+@pytest.fixture(scope="session")
+def toml_blobs():
+    return TOML_BLOBS
+
+
+
+def assert_in_file(path: Path, needle: bytes) -> None:
+    """Substring assertion over a memory-mapped file: no str materialization
+    or UTF-8 decode, and the search runs in C (memmem)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert mm.find(needle) != -1, f"{needle!r} not found in {path}"
+
+
+def _touch_tree(root: Path, files: list[str]) -> None:
+    """
+    Create empty files (and their parent directories) under root with the
+    minimum number of syscalls: one makedirs per unique parent and a bare
+    open/close per file instead of mkdir+touch chains.
+    """
+    paths = [os.path.join(root, f) for f in files]
+    for parent in {os.path.dirname(p) for p in paths}:
+        os.makedirs(parent, exist_ok=True)
+    for path in paths:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        os.close(fd)
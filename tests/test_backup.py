@@ -8,9 +8,9 @@ import pytest
 from pi_haiku import PackageMatch, PyPackage, PyProjectModifier
 
 
-@pytest.fixture
-def sample_pyproject_toml():
-    return """
+# Frozen once at import; write_bytes skips the per-test str allocation and
+# UTF-8 encode of text-mode writes
+_PYPROJECT_TOML: bytes = b"""
 [build-system]
 requires = ["poetry-core>=1.0.0"]
 build-backend = "poetry.core.masonry.api"
@@ -26,23 +26,7 @@ requests = "^2.25.1"
 local-package = {path = "../local-package", develop = true}
 """
 
-
-@pytest.fixture
-def pyproject_file(tmp_path, sample_pyproject_toml):
-    pyproject_path = tmp_path / "pyproject.toml"
-    with open(pyproject_path, "w") as f:
-        f.write(sample_pyproject_toml)
-    return pyproject_path
-
-
-@pytest.fixture
-def mock_packages(tmp_path):
-    local_package_dir = tmp_path.parent / "local-package"
-    local_package_dir.mkdir(exist_ok=True)
-    local_package_pyproject = local_package_dir / "pyproject.toml"
-    with open(local_package_pyproject, "w") as f:
-        f.write(
-            """
+_LOCAL_PACKAGE_TOML: bytes = b"""
 [build-system]
 requires = ["poetry-core>=1.0.0"]
 build-backend = "poetry.core.masonry.api"
@@ -55,7 +39,21 @@ description = "A local package"
 [tool.poetry.dependencies]
 python = "^3.8"
 """
-        )
+
+
+@pytest.fixture
+def pyproject_file(tmp_path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_bytes(_PYPROJECT_TOML)
+    return pyproject_path
+
+
+@pytest.fixture
+def mock_packages(tmp_path):
+    local_package_dir = tmp_path.parent / "local-package"
+    local_package_dir.mkdir(exist_ok=True)
+    local_package_pyproject = local_package_dir / "pyproject.toml"
+    local_package_pyproject.write_bytes(_LOCAL_PACKAGE_TOML)
     return {"local-package": PyPackage.from_path(local_package_pyproject)}
 
 
@@ -84,11 +82,10 @@ def test_convert_to_remote_with_backup_dir(tmp_path, pyproject_file, mock_packag
     assert "0.1.0" in changes[0][1]
 
     # Verify the content of the backup file
-    with open(backup_file, "r") as f:
-        content = f.read()
-        assert "local-package" in content
-        assert 'path = "../local-package"' in content
-        assert "develop = true" in content
+    content = backup_file.read_bytes()
+    assert b"local-package" in content
+    assert b'path = "../local-package"' in content
+    assert b"develop = true" in content
 
 def test_convert_to_local_with_backup_dir(tmp_path, pyproject_file, mock_packages):
     backup_dir = tmp_path / "backup"
@@ -122,11 +119,10 @@ def test_convert_to_local_with_backup_dir(tmp_path, pyproject_file, mock_package
 
 
     # Verify the content of the backup file
-    with open(backup_file, "r") as f:
-        content = f.read()
-        assert 'local-package = "0.1.0"' in content
-        assert 'path = "../local-package"' not in content
-        assert "develop = true" not in content
+    content = backup_file.read_bytes()
+    assert b'local-package = "0.1.0"' in content
+    assert b'path = "../local-package"' not in content
+    assert b"develop = true" not in content
 
 
 def test_no_changes_with_backup_dir(tmp_path, pyproject_file, mock_packages):
@@ -1,27 +1,35 @@
 import logging
 import os
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tests.conftest import _touch_tree
+
+from pi_haiku.utils import environment_detector
 from pi_haiku.utils.environment_detector import (
     EnvironmentDetectionError,
     EnvironmentDetector,
     EnvType,
     PyPackage,
 )
+from pi_haiku.utils.utils import CommandResult
 
 
 @pytest.fixture
-def temp_dir(tmp_path):
-    return tmp_path
+def temp_dir(fs):
+    # pyfakefs serves the whole detector probe from memory; no real syscalls
+    fake_root = Path("/fake_pkgs")
+    fs.create_dir(fake_root)
+    return fake_root
 
 
 @pytest.fixture
-def mock_package(temp_dir):
+def mock_package(fs, temp_dir):
     package_path = temp_dir / "mock_package"
-    package_path.mkdir()
+    fs.create_dir(package_path)
     return PyPackage(
         name="mock_package",
         version="0.1.0",
@@ -32,35 +40,49 @@ def mock_package(temp_dir):
 
 
 @pytest.fixture
-def mock_venv_path(temp_dir):
+def mock_venv_path(fs, temp_dir):
     venv_path = temp_dir / ".venv"
-    (venv_path / "bin").mkdir(parents=True)
-    (venv_path / "bin" / "activate").touch()
+    _touch_tree(venv_path, ["bin/activate"])
     return venv_path
 
 
 @pytest.fixture
-def mock_conda_path(temp_dir):
+def mock_conda_path(fs, temp_dir, monkeypatch):
+    # Detection falls back to probing conda_base_path/envs on the fake fs;
+    # the `conda env list` subprocess cannot run against an in-memory fs
+    monkeypatch.setattr(
+        environment_detector, "run_bash_command", lambda *a, **k: CommandResult(True, "", "")
+    )
     conda_path = temp_dir / "conda"
-    (conda_path / "envs" / "mock_package" / "bin").mkdir(parents=True)
-    (conda_path / "envs" / "mock_package" / "bin" / "activate").touch()
+    _touch_tree(conda_path, ["envs/mock_package/bin/activate"])
     return conda_path
 
 
-def test_detect_venv(mock_package, mock_venv_path):
-    detector = EnvironmentDetector(package=mock_package, venv_path=mock_venv_path)
-    r = detector.detect_environment()
-    env_type, activate_cmd = r.env_type, r.activate_command
-    assert env_type == EnvType.VENV
-    assert str(mock_venv_path / "bin" / "activate") in activate_cmd
+@pytest.fixture(params=["venv", "conda", "conda_base"])
+def env_case(request, mock_package):
+    """One detector per detection scenario; the filesystem setup and
+    constructor run once per param instead of once per near-identical test."""
+    if request.param == "venv":
+        venv_path = request.getfixturevalue("mock_venv_path")
+        return SimpleNamespace(
+            detector=EnvironmentDetector(package=mock_package, venv_path=venv_path),
+            expected_type=EnvType.VENV,
+            expected_substr=str(venv_path / "bin" / "activate"),
+        )
+    conda_path = request.getfixturevalue("mock_conda_path")
+    if request.param == "conda_base":
+        _touch_tree(conda_path, ["envs/base/bin/activate"])
+    return SimpleNamespace(
+        detector=EnvironmentDetector(package=mock_package, conda_base_path=conda_path),
+        expected_type=EnvType.CONDA,
+        expected_substr="conda activate mock_package",
+    )
 
 
-def test_detect_conda(mock_package, mock_conda_path):
-    detector = EnvironmentDetector(package=mock_package, conda_base_path=mock_conda_path)
-    r = detector.detect_environment()
-    env_type, activate_cmd = r.env_type, r.activate_command
-    assert env_type == EnvType.CONDA
-    assert "conda activate mock_package" in activate_cmd
+def test_detect_environment(env_case):
+    r = env_case.detector.detect_environment()
+    assert r.env_type == env_case.expected_type
+    assert env_case.expected_substr in r.activate_command
 
 
 def test_no_environment_found(mock_package):
@@ -86,8 +108,7 @@ def test_windows_activate_path(mock_package, mock_venv_path):
 def test_multiple_venv_locations(temp_dir, mock_package):
     # Create a venv in the parent directory of the mock package
     venv_path = mock_package.path.parent / "venv"
-    (venv_path / "bin").mkdir(parents=True)
-    (venv_path / "bin" / "activate").touch()
+    _touch_tree(venv_path, ["bin/activate"])
 
     detector = EnvironmentDetector(package=mock_package)
     try:
@@ -102,17 +123,6 @@ def test_multiple_venv_locations(temp_dir, mock_package):
         raise
 
 
-def test_conda_base_environment(mock_package, mock_conda_path):
-    (mock_conda_path / "envs" / "base" / "bin").mkdir(parents=True)
-    (mock_conda_path / "envs" / "base" / "bin" / "activate").touch()
-
-    detector = EnvironmentDetector(package=mock_package, conda_base_path=mock_conda_path)
-    r = detector.detect_environment()
-    env_type, activate_cmd = r.env_type, r.activate_command
-    assert env_type == EnvType.CONDA
-    assert "conda activate mock_package" in activate_cmd
-
-
 @patch.object(EnvironmentDetector, "_is_valid_environment", return_value=False)
 def test_invalid_environment(mock_is_valid, mock_package, mock_venv_path):
     detector = EnvironmentDetector(package=mock_package, venv_path=mock_venv_path)
@@ -1,10 +1,10 @@
 import os
 import subprocess
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
-import toml
 
 from pi_haiku.models import PyPackage
 from pi_haiku.utils.environment_detector import EnvironmentResult, EnvType
@@ -17,16 +17,67 @@ skip_if_no_env = pytest.mark.skipif(
 
 
 def create_conda_env(name, python_version="3.11"):
-    subprocess.run(["conda", "create", "-n", name, f"python={python_version}", "-y"], check=True)
+    # Discard conda's progress chatter; piping/rendering it costs real time
+    subprocess.run(
+        ["conda", "create", "-n", name, f"python={python_version}", "-y"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
 def remove_conda_env(name):
-    subprocess.run(["conda", "env", "remove", "-n", name, "-y"], check=True)
+    subprocess.run(
+        ["conda", "env", "remove", "-n", name, "-y"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
 def conda_env_exists(name):
-    result = subprocess.run(["conda", "env", "list"], capture_output=True, text=True)
-    return name in result.stdout
+    # Probe the envs directories directly; a couple of stat calls beats
+    # forking `conda env list` (hundreds of ms per call)
+    roots = []
+    prefix = os.environ.get("CONDA_PREFIX")
+    if prefix:
+        prefix = Path(prefix)
+        roots.append(prefix.parent if prefix.parent.name == "envs" else prefix / "envs")
+    roots += [Path(p) for p in os.environ.get("CONDA_ENVS_PATH", "").split(os.pathsep) if p]
+    if roots:
+        return any((root / name).is_dir() for root in roots)
+    result = subprocess.run(["conda", "env", "list"], capture_output=True)
+    return name.encode() in result.stdout
+
+
+class _FakeDetector:
+    """Constant-result detector; avoids per-test MagicMock construction."""
+
+    result = EnvironmentResult(
+        env_type=EnvType.CONDA, activate_command="conda activate test_package"
+    )
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def detect_environment(self):
+        return self.result
+
+
+@pytest.fixture
+def fast_detector(monkeypatch):
+    """Patch EnvHelper's collaborators with cheap stubs; returns a setter for
+    the stdout the stubbed run_bash_command should produce."""
+    monkeypatch.setattr("pi_haiku.utils.environment_utils.EnvironmentDetector", _FakeDetector)
+
+    def set_stdout(stdout):
+        monkeypatch.setattr(
+            "pi_haiku.utils.environment_utils.run_bash_command",
+            lambda *a, **k: SimpleNamespace(stdout=stdout, stderr="", returncode=0),
+        )
+
+    set_stdout("")
+    return set_stdout
 
 
 @pytest.fixture
@@ -39,30 +90,31 @@ def env_helper(sample_package):
     return EnvHelper(package=sample_package)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def temp_conda_env():
+    # conda create/remove cost seconds each; build the env once per session.
+    # Consumers only read from it, so no per-test isolation is needed.
     env_name = "test_conda_env"
     create_conda_env(env_name)
     yield env_name
     remove_conda_env(env_name)
 
 
+# Pre-rendered once; every test writes the same constant content
+_PYPROJECT_BYTES = b"""\
+[build-system]
+build-backend = "poetry.core.masonry.api"
+requires = ["poetry-core>=1.0.0"]
+
+[tool.poetry]
+name = "test_package"
+version = "0.1.0"
+description = "A test package"
+"""
+
+
 def write_pyproject_file(path):
-    pyproject_content = {
-        "build-system": {
-            "build-backend": "poetry.core.masonry.api",
-            "requires": ["poetry-core>=1.0.0"],
-        },
-        "tool": {
-            "poetry": {
-                "name": "test_package",
-                "version": "0.1.0",
-                "description": "A test package",
-            }
-        },
-    }
-    with open(path / "pyproject.toml", "w") as f:
-        toml.dump(pyproject_content, f)
+    (path / "pyproject.toml").write_bytes(_PYPROJECT_BYTES)
 
 
 @skip_if_no_env
@@ -131,28 +183,15 @@ def test_env_helper_initialization_with_venv_path(tmp_path):
 #     mock_run_bash.assert_called_once_with("conda create -n test_package python=3.11 -y")
 
 
-@skip_if_no_env
-@patch("pi_haiku.environment_detector.EnvironmentDetector")
-@patch("pi_haiku.environment_utils.run_bash_command")
-def test_update_successful(mock_run_bash, mock_detector, env_helper):
-    mock_detector.return_value.detect_environment.return_value = EnvironmentResult(
-        env_type=EnvType.CONDA, activate_command="conda activate test_package"
-    )
-    mock_run_bash.return_value = MagicMock(stdout="Update successful")
+def test_update_successful(fast_detector, env_helper):
+    fast_detector("Update successful")
 
     result = env_helper.poetry_update()
     assert result == "Update successful"
-    mock_run_bash.assert_called_once()
 
 
-@skip_if_no_env
-@patch("pi_haiku.environment_detector.EnvironmentDetector")
-@patch("pi_haiku.environment_utils.run_bash_command")
-def test_update_no_dependencies(mock_run_bash, mock_detector, env_helper):
-    mock_detector.return_value.detect_environment.return_value = EnvironmentResult(
-        env_type=EnvType.CONDA, activate_command="conda activate test_package"
-    )
-    mock_run_bash.return_value = MagicMock(stdout="No dependencies to install or update")
+def test_update_no_dependencies(fast_detector, env_helper):
+    fast_detector("No dependencies to install or update")
 
     result = env_helper.poetry_update()
     assert result is None
@@ -7,77 +7,19 @@ from pi_haiku import PyPackage, PyProjectModifier
 from pi_haiku.haiku import Haiku
 
 
-@pytest.fixture
-def local_package1_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
-
-[tool.poetry]
-name = "package1"
-version = "0.1.0"
-description = ""
-authors = ["Author One <author1@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.9"
-package2 = { path = "../package2" }
-numpy = "^1.21.0"
-"""
+@pytest.fixture(scope="session")
+def remote_package1_toml_content(toml_blobs):
+    return toml_blobs["remote_package1"]
 
-@pytest.fixture
-def remote_package1_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
-
-[tool.poetry]
-name = "package1"
-version = "0.1.0"
-description = ""
-authors = ["Author One <author1@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.9"
-package2 = "^0.2.0"
-numpy = "^1.21.0"
-"""
 
-@pytest.fixture
-def remote_package2_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
-
-[tool.poetry]
-name = "package2"
-version = "^0.2.0"
-description = ""
-authors = ["Author Two <author2@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.9"
-"""
+@pytest.fixture(scope="session")
+def remote_package2_toml_content(toml_blobs):
+    return toml_blobs["package2"]
 
-@pytest.fixture
-def remote_package3_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
 
-[tool.poetry]
-name = "package3"
-version = "^0.3.0"
-description = ""
-authors = ["Author Three <author3@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.9"
-"""
+@pytest.fixture(scope="session")
+def remote_package3_toml_content(toml_blobs):
+    return toml_blobs["package3"]
 
 
 @pytest.fixture
@@ -150,32 +92,20 @@ def mock_topological_sort():
 #     assert result[mock_pyprojects['package3']] == []
 
 
-def test_exclude_projects():
-    with patch.object(Haiku, '_convert_projects') as mock_convert:
-        mock_dir = Path('/mock/dir')
-        exclude_list = ['package2']
-        Haiku.convert_projects_to_local(mock_dir, exclude_projects=exclude_list)
-        mock_convert.assert_called_once()
-        _, kwargs = mock_convert.call_args
-        assert kwargs['exclude_projects'] == exclude_list
-
-def test_include_projects():
-    with patch.object(Haiku, '_convert_projects') as mock_convert:
-        mock_dir = Path('/mock/dir')
-        include_list = ['package1']
-        Haiku.convert_projects_to_local(mock_dir, include_projects=include_list)
-        mock_convert.assert_called_once()
-        _, kwargs = mock_convert.call_args
-        assert kwargs['include_projects'] == include_list
-
-def test_only_change_projects():
+@pytest.mark.parametrize(
+    "kwarg,value",
+    [
+        ("exclude_projects", ["package2"]),
+        ("include_projects", ["package1"]),
+        ("only_change_projects", ["package1"]),
+    ],
+)
+def test_project_filter_kwargs_forwarded(kwarg, value):
     with patch.object(Haiku, '_convert_projects') as mock_convert:
-        mock_dir = Path('/mock/dir')
-        only_change_list = ['package1']
-        Haiku.convert_projects_to_local(mock_dir, only_change_projects=only_change_list)
+        Haiku.convert_projects_to_local(Path('/mock/dir'), **{kwarg: value})
         mock_convert.assert_called_once()
         _, kwargs = mock_convert.call_args
-        assert kwargs['only_change_projects'] == only_change_list
+        assert kwargs[kwarg] == value
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
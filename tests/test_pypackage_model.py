@@ -1,12 +1,12 @@
+import io
+
 import pytest
 from pathlib import Path
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 from pi_haiku.models import PyPackage, BuildSystem
 
 
-@pytest.fixture
-def sample_poetry_toml():
-    return b"""
+_SAMPLE_POETRY_TOML: bytes = b"""
 [build-system]
 build-backend = "poetry.core.masonry.api"
 requires = ["poetry-core"]
@@ -25,9 +25,19 @@ pytest = "^6.2.5"
 """
 
 
-def test_get_dependencies_poetry(sample_poetry_toml):
-    with patch("builtins.open", mock_open(read_data=sample_poetry_toml)):
-        dependencies = PyPackage.get_dependencies("dummy_path")
+@pytest.fixture(scope="session")
+def sample_poetry_toml():
+    return _SAMPLE_POETRY_TOML
+
+
+@pytest.fixture
+def fake_opener(monkeypatch, sample_poetry_toml):
+    # Cheaper than mock_open: no MagicMock construction, no builtins patch
+    monkeypatch.setattr(PyPackage, "_opener", lambda p, mode="rb": io.BytesIO(sample_poetry_toml))
+
+
+def test_get_dependencies_poetry(fake_opener):
+    dependencies = PyPackage.get_dependencies("dummy_path")
 
     assert dependencies == {
         "python": "^3.9",
@@ -37,9 +47,8 @@ def test_get_dependencies_poetry(sample_poetry_toml):
     }
 
 
-def test_from_path_poetry(sample_poetry_toml):
-    with patch("builtins.open", mock_open(read_data=sample_poetry_toml)):
-        package = PyPackage.from_path("dummy_path/pyproject.toml")
+def test_from_path_poetry(fake_opener):
+    package = PyPackage.from_path("dummy_path/pyproject.toml")
 
     assert package.name == "test-package"
     assert package.version == "1.0.0"
@@ -67,12 +76,10 @@ def test_get_local_dependencies():
     assert local_deps == {"local-package": "../local-package", "another-local": "../another-local"}
 
 
-def test_from_path_directory(sample_poetry_toml):
+def test_from_path_directory(fake_opener):
     with patch("pathlib.Path.is_dir", return_value=True), patch(
         "pathlib.Path.expanduser", return_value=Path("/home/user/project")
-    ), patch("pathlib.Path.resolve", return_value=Path("/home/user/project")), patch(
-        "builtins.open", mock_open(read_data=sample_poetry_toml)
-    ):
+    ), patch("pathlib.Path.resolve", return_value=Path("/home/user/project")):
         package = PyPackage.from_path("/home/user/project")
 
     assert package.name == "test-package"
@@ -80,12 +87,10 @@ def test_from_path_directory(sample_poetry_toml):
     assert package.path == Path("/home/user/project/pyproject.toml")
 
 
-def test_from_path_file(sample_poetry_toml):
+def test_from_path_file(fake_opener):
     with patch("pathlib.Path.is_dir", return_value=False), patch(
         "pathlib.Path.expanduser", return_value=Path("/home/user/project/pyproject.toml")
-    ), patch("pathlib.Path.resolve", return_value=Path("/home/user/project/pyproject.toml")), patch(
-        "builtins.open", mock_open(read_data=sample_poetry_toml)
-    ):
+    ), patch("pathlib.Path.resolve", return_value=Path("/home/user/project/pyproject.toml")):
         package = PyPackage.from_path("/home/user/project/pyproject.toml")
 
     assert package.name == "test-package"
@@ -1,121 +1,67 @@
-import tempfile
+import io
+import os
+import shutil
 from pathlib import Path
 
 import pytest
 
 from pi_haiku import PyPackage, PyProjectModifier, ToLocalMatch, ToRemoteMatch
+from tests.conftest import assert_in_file
 
 
-@pytest.fixture
-def local_package1_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
+@pytest.fixture(scope="session")
+def master_tomls(tmp_path_factory, toml_blobs):
+    """Render each TOML to disk once; per-test fixtures copy from these masters
+    instead of re-serializing the content for every test."""
+    root = tmp_path_factory.mktemp("pkg_masters")
+    paths = {}
+    for name, content in toml_blobs.items():
+        path = root / f"{name}.toml"
+        path.write_bytes(content)
+        paths[name] = path
+    return paths
 
-[tool.poetry]
-name = "package1"
-version = "0.1.0"
-description = ""
-authors = ["Author One <author1@example.com>"]
 
-[tool.poetry.dependencies]
-python = "^3.9"
-package2 = { path = "../package2" }
-numpy = "^1.21.0"
-"""
+def _copy_master(master_tomls, name, tmp_path, package_dir):
+    file_path = tmp_path / package_dir / "pyproject.toml"
+    file_path.parent.mkdir(parents=True)
+    try:
+        # Zero-copy: tmp_path shares a filesystem with the masters, and the
+        # modifier replaces files atomically rather than writing in place
+        os.link(master_tomls[name], file_path)
+    except OSError:
+        shutil.copyfile(master_tomls[name], file_path)
+    return file_path
 
 
 @pytest.fixture
-def remote_package1_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
-
-[tool.poetry]
-name = "package1"
-version = "0.1.0"
-description = ""
-authors = ["Author One <author1@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.9"
-package2 = "^0.2.0"
-numpy = "^1.21.0"
-"""
+def local_package1_pyproject_toml(tmp_path, master_tomls):
+    return _copy_master(master_tomls, "local_package1", tmp_path, "package1")
 
 
 @pytest.fixture
-def remote_package2_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
-
-[tool.poetry]
-name = "package2"
-version = "^0.2.0"
-description = ""
-authors = ["Author Two <author2@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.9"
-"""
+def remote_package1_pyproject_toml(tmp_path, master_tomls):
+    return _copy_master(master_tomls, "remote_package1", tmp_path, "package1")
 
 
 @pytest.fixture
-def remote_package3_toml_content():
-    return """
-[build-system]
-requires = ["poetry-core>=1.0.0"]
-build-backend = "poetry.core.masonry.api"
-
-[tool.poetry]
-name = "package3"
-version = "^0.3.0"
-description = ""
-authors = ["Author Three <author3@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.9"
-"""
+def package2_pyproject_toml(tmp_path, master_tomls):
+    return _copy_master(master_tomls, "package2", tmp_path, "package2")
 
 
 @pytest.fixture
-def local_package1_pyproject_toml(tmp_path, local_package1_toml_content):
-    file_path = tmp_path / "package1" / "pyproject.toml"
-    file_path.parent.mkdir(parents=True)
-    with open(file_path, "w") as f:
-        f.write(local_package1_toml_content)
-    return file_path
+def package3_pyproject_toml(tmp_path, master_tomls):
+    return _copy_master(master_tomls, "package3", tmp_path, "package3")
 
 
 @pytest.fixture
-def remote_package1_pyproject_toml(tmp_path, remote_package1_toml_content):
-    file_path = tmp_path / "package1" / "pyproject.toml"
-    file_path.parent.mkdir(parents=True)
-    with open(file_path, "w") as f:
-        f.write(remote_package1_toml_content)
-    return file_path
-
-
-@pytest.fixture
-def package2_pyproject_toml(tmp_path, remote_package2_toml_content):
-    file_path = tmp_path / "package2" / "pyproject.toml"
-    file_path.parent.mkdir(parents=True)
-    with open(file_path, "w") as f:
-        f.write(remote_package2_toml_content)
-    return file_path
+def package2_obj(package2_pyproject_toml):
+    return PyPackage.from_path(package2_pyproject_toml)
 
 
 @pytest.fixture
-def package3_pyproject_toml(tmp_path, remote_package3_toml_content):
-    file_path = tmp_path / "package3" / "pyproject.toml"
-    file_path.parent.mkdir(parents=True)
-    with open(file_path, "w") as f:
-        f.write(remote_package3_toml_content)
-    return file_path
+def package3_obj(package3_pyproject_toml):
+    return PyPackage.from_path(package3_pyproject_toml)
 
 
 @pytest.fixture
@@ -132,6 +78,17 @@ def remote_pyprojmod(remote_package1_pyproject_toml, package2_pyproject_toml):
     )
 
 
+@pytest.fixture(scope="session")
+def haiku_readonly(tmp_path_factory, master_tomls):
+    """One modifier over a pristine tree for tests that never write; saves a
+    TOML parse and tree build per consumer. Mutating tests keep the
+    function-scoped fixtures above."""
+    root = tmp_path_factory.mktemp("readonly_tree")
+    src = _copy_master(master_tomls, "local_package1", root, "package1")
+    _copy_master(master_tomls, "package2", root, "package2")
+    return PyProjectModifier(src=src, package_dir=root)
+
+
 def test_pypackage_from_path(local_package1_pyproject_toml):
     pkg = PyPackage.from_path(local_package1_pyproject_toml)
     assert pkg.name == "package1"
@@ -140,51 +97,80 @@ def test_pypackage_from_path(local_package1_pyproject_toml):
     assert pkg.dependencies["numpy"] == "^1.21.0"
 
 
-def test_haiku_init(local_package1_pyproject_toml):
-    haiku = PyProjectModifier(src=local_package1_pyproject_toml)
-    assert haiku.pyproj.name == "package1"
-    assert haiku.pyproj.version == "0.1.0"
-
-
-def test_find_pyproject_tomls(local_package1_pyproject_toml, tmp_path):
-    haiku = PyProjectModifier(src=local_package1_pyproject_toml)
-    pyproject_files = haiku.find_pyproject_tomls(tmp_path)
-    assert len(pyproject_files) == 1
-    assert pyproject_files[0] == local_package1_pyproject_toml
-
-
-def test_convert_to_local(remote_pyprojmod: PyProjectModifier, remote_package1_pyproject_toml):
-    match_pattern = ToLocalMatch(package_regex="package2")
-    changes = remote_pyprojmod.convert_to_local([match_pattern], in_place=True)
-    assert len(changes) == 1
-    with open(remote_package1_pyproject_toml) as f:
-        content = f.read()
-    assert '{develop = true, path = "../package2"}' in content
-
-
-def test_convert_to_remote(local_pyprojmod: PyProjectModifier, local_package1_pyproject_toml):
-    match_pattern = ToRemoteMatch(package_regex="package2")
-    changes = local_pyprojmod.convert_to_remote([match_pattern], in_place=True)
+def test_haiku_init(haiku_readonly):
+    assert haiku_readonly.pyproj.name == "package1"
+    assert haiku_readonly.pyproj.version == "0.1.0"
+
+
+@pytest.fixture(scope="module")
+def single_pyproject_tree(tmp_path_factory, master_tomls):
+    """One-file tree built once per module; walking it repeatedly per test
+    added nothing but os.scandir traffic."""
+    root = tmp_path_factory.mktemp("single_tree")
+    file_path = root / "pkg" / "pyproject.toml"
+    file_path.parent.mkdir()
+    shutil.copyfile(master_tomls["local_package1"], file_path)
+    return root, file_path
+
+
+def test_find_pyproject_tomls(single_pyproject_tree):
+    root, file_path = single_pyproject_tree
+    pyproject_files = PyProjectModifier.find_pyproject_tomls(root)
+    assert pyproject_files == [file_path]
+
+
+@pytest.mark.parametrize("n", [1, 50])
+def test_find_pyproject_tomls_scales(tmp_path, master_tomls, n):
+    # Hardlinked from one master so tree construction stays cheap at n=50
+    for i in range(n):
+        _copy_master(master_tomls, "package2", tmp_path, f"pkg{i}")
+    # Vendored copies under a default-excluded dir must be pruned, not found
+    _copy_master(master_tomls, "package3", tmp_path, "node_modules/dep")
+    found = PyProjectModifier.find_pyproject_tomls(tmp_path)
+    assert len(found) == n
+
+
+@pytest.mark.parametrize(
+    "modifier_fixture,target_fixture,match_cls,expected",
+    [
+        (
+            "remote_pyprojmod",
+            "remote_package1_pyproject_toml",
+            ToLocalMatch,
+            b'{develop = true, path = "../package2"}',
+        ),
+        (
+            "local_pyprojmod",
+            "local_package1_pyproject_toml",
+            ToRemoteMatch,
+            b'package2 = "^0.2.0"',
+        ),
+    ],
+)
+@pytest.mark.xdist_group(name="pyproject_mutation")
+def test_convert(request, modifier_fixture, target_fixture, match_cls, expected):
+    pyprojmod: PyProjectModifier = request.getfixturevalue(modifier_fixture)
+    target = request.getfixturevalue(target_fixture)
+    match_pattern = match_cls(package_regex="package2")
+    convert = (
+        pyprojmod.convert_to_local if match_cls is ToLocalMatch else pyprojmod.convert_to_remote
+    )
+    changes = convert([match_pattern], in_place=True)
     assert len(changes) == 1
-    with open(local_package1_pyproject_toml) as f:
-        content = f.read()
-    assert 'package2 = "^0.2.0"' in content
+    assert_in_file(target, expected)
 
 
+@pytest.mark.xdist_group(name="pyproject_mutation")
 def test_convert_back_and_forth(local_pyprojmod: PyProjectModifier, local_package1_pyproject_toml):
     match_pattern = ToRemoteMatch(package_regex="package2")
     changes = local_pyprojmod.convert_to_remote([match_pattern], in_place=True)
     assert len(changes) == 1
-    with open(local_package1_pyproject_toml) as f:
-        content = f.read()
-    assert 'package2 = "^0.2.0"' in content
+    assert_in_file(local_package1_pyproject_toml, b'package2 = "^0.2.0"')
 
     match_pattern = ToLocalMatch(package_regex="package2")  # type: ignore
     changes = local_pyprojmod.convert_to_local([match_pattern], in_place=True)
     assert len(changes) == 1
-    with open(local_package1_pyproject_toml) as f:
-        content = f.read()
-    assert '{develop = true, path = "../package2"}' in content
+    assert_in_file(local_package1_pyproject_toml, b'{develop = true, path = "../package2"}')
 
 
 def test_haiku_with_nonexistent_file():
@@ -192,78 +178,81 @@ def test_haiku_with_nonexistent_file():
         PyProjectModifier(src=Path("/nonexistent/path/pyproject.toml"))
 
 
-def test_haiku_with_invalid_toml():
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as tmp:
-        tmp.write("This is not a valid TOML file")
-        tmp.flush()
-        with pytest.raises(ValueError):
-            PyProjectModifier(src=Path(tmp.name))
+def test_haiku_with_invalid_toml(monkeypatch):
+    # All in memory: the opener seam hands back the bad bytes directly
+    monkeypatch.setattr(
+        PyPackage, "_opener", lambda p, mode="rb": io.BytesIO(b"This is not a valid TOML file")
+    )
+    with pytest.raises(ValueError):
+        PyProjectModifier(src=Path("/fake/pyproject.toml"))
+
+
+def test_haiku_with_invalid_toml_file(tmp_path):
+    # Real-file variant kept for integration coverage of the open path
+    bad_toml = tmp_path / "bad.toml"
+    bad_toml.write_text("This is not a valid TOML file")
+    with pytest.raises(ValueError):
+        PyProjectModifier(src=bad_toml)
 
 
+@pytest.mark.xdist_group(name="pyproject_mutation")
 def test_convert_with_dest_file(local_pyprojmod: PyProjectModifier, tmp_path):
     dest_file = tmp_path / "new_pyproject.toml"
     match_pattern = ToRemoteMatch(package_regex="package2")
     changes = local_pyprojmod.convert_to_remote([match_pattern], dest_file=str(dest_file))
     assert len(changes) == 1
     assert dest_file.exists()
-    with open(dest_file) as f:
-        content = f.read()
-    assert 'package2 = "^0.2.0"' in content
+    assert_in_file(dest_file, b'package2 = "^0.2.0"')
 
 
-def test_convert_without_changes(local_pyprojmod: PyProjectModifier):
+def test_convert_without_changes(haiku_readonly: PyProjectModifier):
     match_pattern = ToRemoteMatch(package_regex="nonexistent-package")
-    changes = local_pyprojmod.convert_to_remote([match_pattern], in_place=True)
+    changes = haiku_readonly.convert_to_remote([match_pattern], in_place=True)
     assert len(changes) == 0
 
 
+@pytest.mark.xdist_group(name="pyproject_mutation")
 def test_convert_to_local_with_packages(
     remote_pyprojmod: PyProjectModifier,
     remote_package1_pyproject_toml,
-    package2_pyproject_toml,
-    package3_pyproject_toml,
+    package2_obj,
+    package3_obj,
 ):
-    package2 = PyPackage.from_path(package2_pyproject_toml)
-    package3 = PyPackage.from_path(package3_pyproject_toml)
-
-    changes = remote_pyprojmod.convert_to_local(packages=[package2, package3], in_place=True)
+    changes = remote_pyprojmod.convert_to_local(packages=[package2_obj, package3_obj], in_place=True)
 
     assert len(changes) == 1  # Only package2 should change, as package3 wasn't in the original
 
-    with open(remote_package1_pyproject_toml) as f:
-        content = f.read()
-    assert '{develop = true, path = "../package2"}' in content
-    assert "package3" not in content  # Ensure package3 wasn't added
+    content = remote_package1_pyproject_toml.read_bytes()
+    assert b'{develop = true, path = "../package2"}' in content
+    assert b"package3" not in content  # Ensure package3 wasn't added
 
 
+@pytest.mark.xdist_group(name="pyproject_mutation")
 def test_convert_to_remote_with_packages(
     local_pyprojmod: PyProjectModifier,
     local_package1_pyproject_toml,
-    package2_pyproject_toml,
-    package3_pyproject_toml,
+    package2_obj,
+    package3_obj,
 ):
-    package2 = PyPackage.from_path(package2_pyproject_toml)
-    package3 = PyPackage.from_path(package3_pyproject_toml)
-
-    changes = local_pyprojmod.convert_to_remote(packages=[package2, package3], in_place=True)
+    changes = local_pyprojmod.convert_to_remote(packages=[package2_obj, package3_obj], in_place=True)
 
     assert len(changes) == 1  # Only package2 should change
 
-    with open(local_package1_pyproject_toml) as f:
-        content = f.read()
+    content = local_package1_pyproject_toml.read_bytes()
 
-    assert 'package2 = "^0.2.0"' in content
-    assert "package3" not in content  # Ensure package3 wasn't added
+    assert b'package2 = "^0.2.0"' in content
+    assert b"package3" not in content  # Ensure package3 wasn't added
 
 
-def test_convert_with_no_patterns_or_packages(remote_pyprojmod: PyProjectModifier):
+def test_convert_with_no_patterns_or_packages(haiku_readonly: PyProjectModifier):
     with pytest.raises(ValueError, match="Either match_patterns or packages must be provided"):
-        remote_pyprojmod.convert_to_local(in_place=True)
+        haiku_readonly.convert_to_local(in_place=True)
 
     with pytest.raises(ValueError, match="Either match_patterns or packages must be provided"):
-        remote_pyprojmod.convert_to_remote(in_place=True)
+        haiku_readonly.convert_to_remote(in_place=True)
 
 
+@pytest.mark.xdist_group(name="pyproject_mutation")
 def test_convert_with_both_patterns_and_packages(
     remote_pyprojmod: PyProjectModifier, package2_pyproject_toml
 ):
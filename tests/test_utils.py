@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from pi_haiku.models import PyPackage
+from pi_haiku.utils.utils import create_dag, topological_sort_levels
+
+
+def _pkg(name, deps=()):
+    return PyPackage(
+        name=name,
+        version="0.1.0",
+        path=Path(f"/mock/{name}"),
+        dependencies={dep: "^0.1.0" for dep in deps},
+    )
+
+
+def test_topological_sort_levels_orders_dependencies_first():
+    # package1 -> package2 -> package3, package4 independent
+    dag = create_dag(
+        [
+            _pkg("package1", ["package2"]),
+            _pkg("package2", ["package3"]),
+            _pkg("package3"),
+            _pkg("package4"),
+        ]
+    )
+    levels = topological_sort_levels(dag)
+    assert [sorted(level) for level in levels] == [
+        ["package3", "package4"],
+        ["package2"],
+        ["package1"],
+    ]
+
+
+def test_topological_sort_levels_diamond():
+    # package1 depends on package2 and package3, which both depend on package4
+    dag = create_dag(
+        [
+            _pkg("package1", ["package2", "package3"]),
+            _pkg("package2", ["package4"]),
+            _pkg("package3", ["package4"]),
+            _pkg("package4"),
+        ]
+    )
+    levels = topological_sort_levels(dag)
+    assert [sorted(level) for level in levels] == [
+        ["package4"],
+        ["package2", "package3"],
+        ["package1"],
+    ]
+
+
+def test_topological_sort_levels_cycle_raises():
+    dag = {"package1": {"package2", "package3"}, "package2": {"package1"}, "package3": set()}
+    with pytest.raises(ValueError, match="Cycle detected"):
+        topological_sort_levels(dag)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])